@@ -0,0 +1,70 @@
+from typing import Iterable
+import math
+import hashlib
+from threading import Lock
+
+class BloomFilter:
+    """A space-efficient set supporting insertions and membership tests.
+    
+    Notes
+    -----
+        A membership test may return a false positive with a probability
+        close to the configured error rate, but never a false negative.
+    """
+    
+    def __init__(
+            self,
+            capacity: int = 1_000_000,
+            error_rate: float = 0.001
+        ) -> None:
+        
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        
+        if not 0 < error_rate < 1:
+            raise ValueError('error rate must be between 0 and 1')
+        
+        # optimal number of bits and hash functions
+        self._n_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._n_hashes = max(1, round(self._n_bits / capacity * math.log(2)))
+        
+        self._bits = bytearray((self._n_bits + 7) // 8)
+        self._lock = Lock()
+    
+    @property
+    def n_bits(self) -> int:
+        return self._n_bits
+    
+    @property
+    def n_hashes(self) -> int:
+        return self._n_hashes
+    
+    def _positions(self, item: str) -> list[int]:
+        
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        
+        # derive all positions from two hashes (Kirsch-Mitzenmacher)
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        
+        return [(h1 + i * h2) % self._n_bits for i in range(self._n_hashes)]
+    
+    def add(self, item: str):
+        
+        positions = self._positions(item)
+        
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+    
+    def update(self, items: Iterable[str]):
+        
+        for item in items:
+            self.add(item)
+    
+    def __contains__(self, item: str) -> bool:
+        
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
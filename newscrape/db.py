@@ -1,19 +1,77 @@
 from typing import Self, Optional, Iterable
-from datetime import datetime, timedelta
-from pymongo import MongoClient
+from datetime import date, datetime, timedelta
+from threading import Lock
+from pymongo import MongoClient, ASCENDING, TEXT, UpdateOne, DeleteOne
+from pymongo.errors import OperationFailure, DuplicateKeyError, BulkWriteError
+from pymongo.change_stream import ChangeStream
 from bson import ObjectId
-from .schema import News
+from .bloom import BloomFilter
+from .headline_index import HeadlineIndex
+from .url import canonicalize_url
+from .text import is_truncated_headline_of, contains_cjk
+from .schema import News, Language
 from .schema.news import (
+    DATE,
+    PUBLICATION,
     HEADLINE,
-    LINK
+    LINK,
+    LANGUAGE,
+    LEGACY_DATE_FORMAT,
+    to_date_time
 )
 
 NEWS_COLLECTION_NAME = 'news'
 IS_HEADLINE_TRUNCATED = 'is_headline_truncated'
+STORY_ID = 'story_id'
+
+STORIES_COLLECTION_NAME = 'stories'
+SIGNATURE = 'signature'
+BAND_KEYS = 'band_keys'
+
+# relevance of a news to a headline search
+SCORE = 'score'
+
+# the news language field uses codes that MongoDB text search
+# does not understand, so the text index reads a field that never exists
+TEXT_LANGUAGE_OVERRIDE = 'text_language'
+
+RESUME_TOKENS_COLLECTION_NAME = 'resume_tokens'
+RESUME_TOKEN = 'resume_token'
+
+# minimum capacity of the news link filter
+NEWS_LINK_FILTER_CAPACITY = 1_000_000
+NEWS_LINK_FILTER_ERROR_RATE = 0.001
+
+# error code of a unique index violation
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# news link filters shared by all clients in the process,
+# keyed by the server addresses and the database name
+_news_link_filters: dict[tuple[frozenset, str], BloomFilter] = {}
+_news_link_filters_lock = Lock()
 
 class NewsDBClient(MongoClient):
+    """MongoDB client of the news scraper.
     
-    def __init__(self, *, database_name: str, **kwargs):
+    Notes
+    -----
+        Links are unique among the news, which is enforced by a unique index.
+        The index cannot be created while links stored before canonicalization
+        are duplicated. Call `migrate_news_links` once to canonicalize
+        and deduplicate them and then create the index.
+        
+        The news link filter only learns the links inserted by its own process.
+        With several writer processes, the unique index prevents
+        the links inserted by the other processes from being stored twice.
+    """
+    
+    def __init__(
+            self, *, 
+            database_name: str, 
+            use_news_link_filter: bool = True,
+            use_local_headline_index: bool = False,
+            **kwargs
+        ):
         
         super().__init__(**kwargs)
         
@@ -22,6 +80,60 @@ class NewsDBClient(MongoClient):
         
         # news collection
         self._news_collection = self._datebase.get_collection(NEWS_COLLECTION_NAME)
+        
+        # story collection, grouping syndicated copies of the same news
+        self._stories_collection = self._datebase.get_collection(STORIES_COLLECTION_NAME)
+        
+        # resume tokens of change streams, keyed by the name of the consumer
+        self._resume_tokens_collection = self._datebase.get_collection(RESUME_TOKENS_COLLECTION_NAME)
+        
+        # possible positives of the news link filter are confirmed by link
+        self._create_unique_news_link_index()
+        
+        # candidate stories are looked up by their LSH band keys
+        self._stories_collection.create_index(BAND_KEYS)
+        self._news_collection.create_index(STORY_ID, sparse=True)
+        
+        # range queries by date, optionally restricted to a publication
+        self._news_collection.create_index([(DATE, ASCENDING), (PUBLICATION, ASCENDING)])
+        self._news_collection.create_index([(PUBLICATION, ASCENDING), (DATE, ASCENDING)])
+        
+        # headlines are searched in memory if text search is unavailable on the server
+        self._headline_index: Optional[HeadlineIndex] = None
+        self._headline_index_lock = Lock()
+        self._use_local_headline_index = use_local_headline_index
+        if not use_local_headline_index:
+            self._news_collection.create_index(
+                [(HEADLINE, TEXT)],
+                default_language='english',
+                language_override=TEXT_LANGUAGE_OVERRIDE
+            )
+        
+        # an in-memory filter answering most link existence checks,
+        # links stored before canonicalization only match after migrate_news_links
+        self._news_link_filter: Optional[BloomFilter] = None
+        if use_news_link_filter:
+            self._news_link_filter = self._load_news_link_filter(database_name)
+    
+    def _create_unique_news_link_index(self) -> bool:
+        
+        try:
+            self._news_collection.create_index(
+                LINK,
+                unique=True,
+                partialFilterExpression={
+                    LINK: {
+                        '$type': 'string'
+                    }
+                }
+            )
+        
+        # duplicated links or a previous non-unique index,
+        # both are resolved by migrate_news_links
+        except OperationFailure:
+            return False
+        
+        return True
     
     @classmethod
     def from_host_and_port(
@@ -37,10 +149,94 @@ class NewsDBClient(MongoClient):
             port=port
         )
     
+    def _load_news_link_filter(self, database_name: str) -> BloomFilter:
+        
+        # clients of different servers may use the same database name
+        key = (
+            frozenset(self.topology_description.server_descriptions().keys()),
+            database_name
+        )
+        
+        with _news_link_filters_lock:
+            
+            # the filter is seeded only once per process
+            news_link_filter = _news_link_filters.get(key, None)
+            if news_link_filter is not None:
+                return news_link_filter
+            
+            links = self.find_all_news_links()
+            
+            # leave room for the news to be inserted
+            news_link_filter = BloomFilter(
+                capacity=max(2 * len(links), NEWS_LINK_FILTER_CAPACITY),
+                error_rate=NEWS_LINK_FILTER_ERROR_RATE
+            )
+            news_link_filter.update(map(canonicalize_url, links))
+            
+            _news_link_filters[key] = news_link_filter
+            
+            return news_link_filter
+    
+    def _add_to_news_link_filter(self, news_collection: Iterable[News]):
+        
+        if self._news_link_filter is None: return
+        
+        for news in news_collection:
+            link = news.get(LINK, None)
+            if link is not None:
+                self._news_link_filter.add(canonicalize_url(link))
+    
+    def _add_to_headline_index(self, news_collection: Iterable[dict]):
+        
+        # wait for an ongoing build, which may have missed the news
+        with self._headline_index_lock:
+            
+            # the index is built on the first search
+            if self._headline_index is None: return
+            
+            for news in news_collection:
+                self._headline_index.add(
+                    id=news['_id'],
+                    headline=news.get(HEADLINE, None),
+                    date=news.get(DATE, None),
+                    language=news.get(LANGUAGE, None)
+                )
+    
+    def _load_headline_index(self) -> HeadlineIndex:
+        
+        with self._headline_index_lock:
+            
+            if self._headline_index is None:
+                
+                headline_index = HeadlineIndex()
+                for document in self._news_collection.find(
+                        filter={},
+                        projection=[HEADLINE, DATE, LANGUAGE]
+                    ):
+                    headline_index.add(
+                        id=document['_id'],
+                        headline=document.get(HEADLINE, None),
+                        date=document.get(DATE, None),
+                        language=document.get(LANGUAGE, None)
+                    )
+                
+                self._headline_index = headline_index
+            
+            return self._headline_index
+    
     def insert_one_news(self, news: News) -> Optional[ObjectId]:
         
         # insert into database
-        insertion_result = self._news_collection.insert_one(news)
+        try:
+            insertion_result = self._news_collection.insert_one(news)
+        
+        # the link has been stored, e.g., by another process
+        except DuplicateKeyError:
+            return None
+        
+        # remember the link
+        self._add_to_news_link_filter([news])
+        self._add_to_headline_index([news])
         
         # inserted ID
         return insertion_result.inserted_id
@@ -51,21 +247,113 @@ class NewsDBClient(MongoClient):
         if len(news_collection) == 0: return []
         
         # insert into database
-        insertion_result = self._news_collection.insert_many(news_collection)
+        try:
+            self._news_collection.insert_many(news_collection, ordered=False)
+        
+        # skip the links that have been stored, e.g., by another process
+        except BulkWriteError as e:
+            
+            write_errors = e.details.get('writeErrors', [])
+            if any(error['code'] != DUPLICATE_KEY_ERROR_CODE for error in write_errors):
+                raise
+            
+            duplicated_indices = {error['index'] for error in write_errors}
+            news_collection = [
+                news
+                for i, news in enumerate(news_collection)
+                if i not in duplicated_indices
+            ]
+        
+        # remember the links
+        self._add_to_news_link_filter(news_collection)
+        self._add_to_headline_index(news_collection)
         
         # inserted IDs
-        return insertion_result.inserted_ids
+        return [news['_id'] for news in news_collection]
     
-    def does_news_link_exist(self, link: str) -> bool:
+    def does_news_link_exist(self, link: Optional[str]) -> bool:
+        
+        # news without links are never considered stored
+        if link is None: return False
+        
+        canonical_link = canonicalize_url(link)
         
+        # the link has definitely not been stored
+        if self._news_link_filter is not None \
+            and canonical_link not in self._news_link_filter:
+            return False
+        
+        # confirm a possible positive against the database,
+        # links stored before canonicalization are rewritten by migrate_news_links
         return self._news_collection.find_one(
             filter={
                 LINK: {
-                    '$eq': link
+                    '$eq': canonical_link
                 }
             }
         ) is not None
     
+    def migrate_news_links(self) -> int:
+        """Rewrite the links stored before canonicalization into their canonical form,
+        remove the news whose canonical links are duplicated,
+        and then create the unique index of links.
+        
+        Notes
+        -----
+            Of the news sharing a canonical link, the earliest inserted one is kept.
+
+        Returns
+        -------
+        int
+            Number of migrated or removed news
+        """
+        
+        # drop a previous non-unique index
+        for name, index_information in self._news_collection.index_information().items():
+            if index_information['key'] == [(LINK, ASCENDING)] \
+                and not index_information.get('unique', False):
+                self._news_collection.drop_index(name)
+        
+        # the duplicates are removed before the links are rewritten
+        delete_requests = []
+        update_requests = []
+        canonical_links = set()
+        document: dict
+        for document in self._news_collection.find(
+                filter={
+                    LINK: {
+                        '$type': 'string'
+                    }
+                },
+                projection={LINK: 1}
+            ).sort('_id', ASCENDING):
+            
+            link = document[LINK]
+            canonical_link = canonicalize_url(link)
+            
+            # a later copy of a stored link
+            if canonical_link in canonical_links:
+                delete_requests.append(DeleteOne(filter={'_id': document['_id']}))
+                continue
+            canonical_links.add(canonical_link)
+            
+            if canonical_link != link:
+                update_requests.append(UpdateOne(
+                    filter={'_id': document['_id']},
+                    update={'$set': {LINK: canonical_link}}
+                ))
+        
+        requests = delete_requests + update_requests
+        
+        n_migrated_news = 0
+        if len(requests) > 0:
+            bulk_write_result = self._news_collection.bulk_write(requests, ordered=True)
+            n_migrated_news = bulk_write_result.modified_count + bulk_write_result.deleted_count
+        
+        self._create_unique_news_link_index()
+        
+        return n_migrated_news
+    
     def find_all_news(self, fields: list[str] = []) -> list[News]:
         
         return list(map(
@@ -124,6 +412,16 @@ class NewsDBClient(MongoClient):
             fields=fields
         )
     
+    def is_news_headline_truncated(self, id: ObjectId) -> bool:
+        
+        return self._news_collection.find_one(
+            filter={
+                '_id': id,
+                IS_HEADLINE_TRUNCATED: True
+            },
+            projection={'_id': 1}
+        ) is not None
+    
     def find_all_news_links(self) -> list[str]:
         
         links = []
@@ -150,4 +448,436 @@ class NewsDBClient(MongoClient):
                 }
             }
         )
-    
\ No newline at end of file
+        
+        # keep the local index in sync
+        if self._headline_index is not None:
+            self._add_to_headline_index(self._news_collection.find(
+                filter={'_id': id},
+                projection=[HEADLINE, DATE, LANGUAGE]
+            ))
+        
+    def update_truncated_news_headlines_in_story(self, story_id: ObjectId, headline: str) -> list[ObjectId]:
+        """Copy a recovered headline onto the truncated copies of a story.
+        
+        Notes
+        -----
+            Different stories sharing an opening may be clustered together,
+            hence only the copies whose truncated headlines
+            are the beginning of the recovered headline are updated.
+            The other copies stay truncated and are enriched on their own.
+
+        Returns
+        -------
+        list[ObjectId]
+            IDs of the updated news
+        """
+        
+        ids = [
+            document['_id']
+            for document in self._news_collection.find(
+                filter={
+                    STORY_ID: story_id,
+                    IS_HEADLINE_TRUNCATED: True
+                },
+                projection={HEADLINE: 1}
+            )
+            if is_truncated_headline_of(document.get(HEADLINE, None) or '', headline)
+        ]
+        if len(ids) == 0: return []
+        
+        self._news_collection.update_many(
+            filter={
+                '_id': {
+                    '$in': ids
+                }
+            },
+            update={
+                '$set': {
+                    HEADLINE: headline
+                },
+                '$unset': {
+                    IS_HEADLINE_TRUNCATED: ''
+                }
+            }
+        )
+        
+        # keep the local index in sync
+        if self._headline_index is not None:
+            self._add_to_headline_index(self._news_collection.find(
+                filter={'_id': {'$in': ids}},
+                projection=[HEADLINE, DATE, LANGUAGE]
+            ))
+        
+        return ids
+    
+    def insert_story(self, signature: list[int], band_keys: list[str]) -> ObjectId:
+        
+        insertion_result = self._stories_collection.insert_one({
+            SIGNATURE: signature,
+            BAND_KEYS: band_keys
+        })
+        
+        return insertion_result.inserted_id
+    
+    def find_stories_by_band_keys(self, band_keys: list[str]) -> list[dict]:
+        
+        return list(self._stories_collection.find(
+            filter={
+                BAND_KEYS: {
+                    '$in': band_keys
+                }
+            },
+            projection={
+                SIGNATURE: 1
+            }
+        ))
+    
+    def watch_inserted_news_with_truncated_headlines(
+            self,
+            resume_after: Optional[dict] = None,
+            max_await_time_ms: Optional[int] = None
+        ) -> ChangeStream:
+        """Open a change stream of the news with truncated headlines
+        inserted into the database.
+        
+        Notes
+        -----
+            Change streams are only available on replica sets,
+            which may consist of a single node.
+        """
+        
+        return self._news_collection.watch(
+            pipeline=[
+                {
+                    '$match': {
+                        'operationType': 'insert',
+                        f'fullDocument.{IS_HEADLINE_TRUNCATED}': True
+                    }
+                }
+            ],
+            resume_after=resume_after,
+            max_await_time_ms=max_await_time_ms
+        )
+    
+    def find_resume_token(self, name: str) -> Optional[dict]:
+        
+        document = self._resume_tokens_collection.find_one(filter={'_id': name})
+        if document is None: return None
+        
+        return document[RESUME_TOKEN]
+    
+    def update_resume_token(self, name: str, resume_token: dict):
+        
+        self._resume_tokens_collection.update_one(
+            filter={
+                '_id': name
+            },
+            update={
+                '$set': {
+                    RESUME_TOKEN: resume_token
+                }
+            },
+            upsert=True
+        )
+    
+    def migrate_news_dates(self) -> int:
+        """Convert the dates stored as strings into BSON dates.
+
+        Returns
+        -------
+        int
+            Number of migrated news
+        """
+        
+        update_result = self._news_collection.update_many(
+            filter={
+                DATE: {
+                    '$type': 'string'
+                }
+            },
+            update=[
+                {
+                    '$set': {
+                        DATE: {
+                            '$dateFromString': {
+                                'dateString': f'${DATE}',
+                                'format': LEGACY_DATE_FORMAT
+                            }
+                        }
+                    }
+                }
+            ]
+        )
+        
+        return update_result.modified_count
+    
+    def find_news_published_within_date_range(
+            self,
+            date_start: date,
+            date_end: date,
+            publication: Optional[str] = None,
+            fields: list[str] = []
+        ) -> list[News]:
+        """Find news published from `date_start` to `date_end`, both inclusive."""
+        
+        return list(map(
+            News.from_document,
+            self._news_collection.find(
+                filter=self._create_date_range_filter(
+                    date_start=date_start,
+                    date_end=date_end,
+                    publication=publication
+                ),
+                projection=fields
+            ).sort(DATE, ASCENDING)
+        ))
+    
+    def count_news_per_date(
+            self,
+            date_start: date,
+            date_end: date,
+            publication: Optional[str] = None
+        ) -> list[dict]:
+        """Count news published on each date.
+
+        Returns
+        -------
+        list[dict]
+            Documents with fields `date` and `count`, sorted by date
+        """
+        
+        return self._count_news(
+            group_fields=[DATE],
+            date_start=date_start,
+            date_end=date_end,
+            publication=publication
+        )
+    
+    def count_news_per_publication(
+            self,
+            date_start: date,
+            date_end: date
+        ) -> list[dict]:
+        """Count news published by each publication.
+
+        Returns
+        -------
+        list[dict]
+            Documents with fields `publication` and `count`, sorted by publication
+        """
+        
+        return self._count_news(
+            group_fields=[PUBLICATION],
+            date_start=date_start,
+            date_end=date_end
+        )
+    
+    def count_news_per_date_and_publication(
+            self,
+            date_start: date,
+            date_end: date
+        ) -> list[dict]:
+        """Count news published by each publication on each date.
+
+        Returns
+        -------
+        list[dict]
+            Documents with fields `date`, `publication` and `count`,
+            sorted by date and then publication
+        """
+        
+        return self._count_news(
+            group_fields=[DATE, PUBLICATION],
+            date_start=date_start,
+            date_end=date_end
+        )
+    
+    def _count_news(
+            self,
+            group_fields: list[str],
+            date_start: date,
+            date_end: date,
+            publication: Optional[str] = None
+        ) -> list[dict]:
+        
+        return list(self._news_collection.aggregate([
+            
+            # an indexed range scan
+            {
+                '$match': self._create_date_range_filter(
+                    date_start=date_start,
+                    date_end=date_end,
+                    publication=publication
+                )
+            },
+            {
+                '$group': {
+                    '_id': {field: f'${field}' for field in group_fields},
+                    'count': {'$sum': 1}
+                }
+            },
+            
+            # flatten the group keys
+            {
+                '$replaceWith': {
+                    '$mergeObjects': ['$_id', {'count': '$count'}]
+                }
+            },
+            {
+                '$sort': {field: ASCENDING for field in group_fields}
+            }
+        ]))
+    
+    def _create_date_range_filter(
+            self,
+            date_start: date,
+            date_end: date,
+            publication: Optional[str] = None
+        ) -> dict:
+        
+        filter = {
+            DATE: {
+                '$gte': to_date_time(date_start),
+                '$lt': to_date_time(date_end + timedelta(days=1))
+            }
+        }
+        
+        if publication is not None:
+            filter[PUBLICATION] = publication
+        
+        return filter
+    
+    def search_headlines(
+            self,
+            text: str,
+            date_start: Optional[date] = None,
+            date_end: Optional[date] = None,
+            language: Optional[Language | str] = None,
+            limit: int = 20,
+            skip: int = 0,
+            fields: list[str] = []
+        ) -> list[News]:
+        """Search news by keywords in their headlines.
+
+        Parameters
+        ----------
+        text : str
+            Keywords, any of which should appear in the headline
+        date_start : Optional[date], optional
+            Earliest publication date, by default None
+        date_end : Optional[date], optional
+            Latest publication date, by default None
+        language : Optional[Language | str], optional
+            Only search news in the specified language, by default None
+        limit : int, optional
+            Maximum number of news to return, by default 20
+        skip : int, optional
+            Number of news to skip for pagination, by default 0
+        fields : list[str], optional
+            Fields to return, by default all fields
+
+        Returns
+        -------
+        list[News]
+            News from the most relevant, with their relevance in the field `score`
+        
+        Notes
+        -----
+            Queries containing Chinese text are answered by the local headline index,
+            which is built on the first such query, even if the server text index is used otherwise.
+        """
+        
+        if isinstance(language, str):
+            language = Language.from_str(language)
+        
+        # the server text index cannot split Chinese text into words,
+        # so such queries always use the local index
+        if self._use_local_headline_index or contains_cjk(text):
+            return self._search_headlines_locally(
+                text=text,
+                date_start=date_start,
+                date_end=date_end,
+                language=language,
+                limit=limit,
+                skip=skip,
+                fields=fields
+            )
+        
+        filter = {
+            '$text': {
+                '$search': text
+            }
+        }
+        
+        if date_start is not None or date_end is not None:
+            filter[DATE] = {}
+            if date_start is not None:
+                filter[DATE]['$gte'] = to_date_time(date_start)
+            if date_end is not None:
+                filter[DATE]['$lt'] = to_date_time(date_end + timedelta(days=1))
+        
+        if language is not None:
+            filter[LANGUAGE] = language.value
+        
+        # include the relevance
+        projection = {SCORE: {'$meta': 'textScore'}}
+        for field in fields:
+            projection[field] = 1
+        
+        return list(map(
+            News.from_document,
+            self._news_collection.find(
+                filter=filter,
+                projection=projection
+            )
+            .sort([(SCORE, {'$meta': 'textScore'})])
+            .skip(skip)
+            .limit(limit)
+        ))
+    
+    def _search_headlines_locally(
+            self,
+            text: str,
+            date_start: Optional[date],
+            date_end: Optional[date],
+            language: Optional[Language],
+            limit: int,
+            skip: int,
+            fields: list[str]
+        ) -> list[News]:
+        
+        headline_index = self._load_headline_index()
+        
+        results = headline_index.search(
+            text=text,
+            date_start=to_date_time(date_start) if date_start is not None else None,
+            date_end=to_date_time(date_end + timedelta(days=1)) if date_end is not None else None,
+            language=language.value if language is not None else None,
+            limit=limit,
+            skip=skip
+        )
+        if len(results) == 0: return []
+        
+        # fetch the matched news
+        scores = dict(results)
+        documents = {
+            document['_id']: document
+            for document in self._news_collection.find(
+                filter={
+                    '_id': {
+                        '$in': list(scores.keys())
+                    }
+                },
+                projection=fields
+            )
+        }
+        
+        # keep the ranking
+        news_list = []
+        for id, score in results:
+            document = documents.get(id, None)
+            if document is None: continue
+            document[SCORE] = score
+            news_list.append(News.from_document(document))
+        
+        return news_list
@@ -0,0 +1,151 @@
+from typing import Optional
+import math
+from datetime import datetime
+from collections import Counter
+from threading import Lock
+from bson import ObjectId
+from .text import TOKEN_RE, is_cjk, tokenize
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+def index_terms(headline: str) -> list[str]:
+    
+    terms = tokenize(headline)
+    
+    # single CJK characters are also indexed so that
+    # one-character queries, which are not split into bigrams, match
+    for token in TOKEN_RE.findall(headline.lower()):
+        if is_cjk(token) and len(token) > 1:
+            terms.extend(token)
+    
+    return terms
+
+class HeadlineIndex:
+    """An in-memory inverted index of news headlines ranked by BM25.
+    
+    Notes
+    -----
+        This is for deployments where MongoDB text search is not available.
+    """
+    
+    def __init__(self) -> None:
+        
+        # term -> news ID -> term frequency
+        self._postings: dict[str, dict[ObjectId, int]] = {}
+        
+        # news ID -> (terms, date, language)
+        self._documents: dict[ObjectId, tuple[list[str], Optional[datetime], Optional[str]]] = {}
+        
+        self._total_length = 0
+        self._lock = Lock()
+    
+    def __len__(self) -> int:
+        return len(self._documents)
+    
+    def add(
+            self,
+            id: ObjectId,
+            headline: Optional[str],
+            date: Optional[datetime] = None,
+            language: Optional[str] = None
+        ):
+        
+        terms = index_terms(headline) if headline is not None else []
+        
+        # dates stored as strings before the migration cannot be filtered
+        if not isinstance(date, datetime):
+            date = None
+        
+        with self._lock:
+            
+            # replace the previous version
+            self._remove(id)
+            
+            for term, frequency in Counter(terms).items():
+                self._postings.setdefault(term, {})[id] = frequency
+            
+            self._documents[id] = (terms, date, language)
+            self._total_length += len(terms)
+    
+    def remove(self, id: ObjectId):
+        
+        with self._lock:
+            self._remove(id)
+    
+    def _remove(self, id: ObjectId):
+        
+        document = self._documents.pop(id, None)
+        if document is None: return
+        
+        terms = document[0]
+        for term in set(terms):
+            postings = self._postings[term]
+            del postings[id]
+            if len(postings) == 0:
+                del self._postings[term]
+        
+        self._total_length -= len(terms)
+    
+    def search(
+            self,
+            text: str,
+            date_start: Optional[datetime] = None,
+            date_end: Optional[datetime] = None,
+            language: Optional[str] = None,
+            limit: int = 20,
+            skip: int = 0
+        ) -> list[tuple[ObjectId, float]]:
+        """Find the news whose headlines match any of the terms in the text.
+        
+        Returns
+        -------
+        list[tuple[ObjectId, float]]
+            News IDs and their scores, from the most relevant
+        """
+        
+        terms = set(tokenize(text))
+        
+        with self._lock:
+            
+            n_documents = len(self._documents)
+            if n_documents == 0: return []
+            average_length = self._total_length / n_documents
+            
+            scores: dict[ObjectId, float] = {}
+            for term in terms:
+                
+                postings = self._postings.get(term, None)
+                if postings is None: continue
+                
+                idf = math.log(1 + (n_documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                
+                for id, frequency in postings.items():
+                    
+                    length = len(self._documents[id][0])
+                    scores[id] = scores.get(id, 0.0) + idf * frequency * (K1 + 1) / (
+                        frequency + K1 * (1 - B + B * length / average_length)
+                    )
+            
+            # apply the filters
+            results = []
+            for id, score in scores.items():
+                
+                _, date, document_language = self._documents[id]
+                
+                if language is not None and document_language != language:
+                    continue
+                
+                if date_start is not None and (date is None or date < date_start):
+                    continue
+                
+                if date_end is not None and (date is None or date >= date_end):
+                    continue
+                
+                results.append((id, score))
+        
+        # most relevant first
+        results.sort(key=lambda result: result[1], reverse=True)
+        
+        return results[skip:skip + limit]
@@ -1,4 +1,5 @@
 from typing import Self, Optional
+from datetime import date, datetime
 from bson import ObjectId
 
 # fields of interest
@@ -6,6 +7,7 @@ DATE = 'date'
 PUBLICATION = 'publication'
 HEADLINE = 'headline'
 LINK = 'link'
+LANGUAGE = 'language'
 FIELDS_OF_INTEREST = [
     DATE,
     PUBLICATION,
@@ -13,6 +15,14 @@ FIELDS_OF_INTEREST = [
     LINK
 ]
 
+# format of dates stored as strings by earlier versions
+LEGACY_DATE_FORMAT = '%Y-%m-%d'
+
+def to_date_time(d: date) -> datetime:
+    """Convert a date into a BSON compatible date time at midnight."""
+    
+    return datetime(d.year, d.month, d.day)
+
 class News(dict):
     
     def __init__(self, *args, **kwargs) -> None:
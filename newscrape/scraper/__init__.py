@@ -1,16 +1,22 @@
-import requests
+from typing import Optional
 from datetime import date, timedelta
 from itertools import filterfalse
 from concurrent.futures import ThreadPoolExecutor, wait
 from bs4 import BeautifulSoup
-from ..db import NewsDBClient
-from ..schema import Language
+from ..db import (
+    NewsDBClient,
+    STORY_ID
+)
+from ..schema import News, Language
 from ..schema.news import LINK
 from .search import (
-    HEADERS,
-    search_news
+    search_news,
+    NewsSearchResult
 )
+from .transport import HTTPTransport
+from .parsing import HTMLParser
 from ..webdriver import WebDriver
+from ..story import StoryClusterer
 from .headline import (
     find_news_headline_from_news_post_html,
     NewsHeadlinePicker
@@ -23,13 +29,30 @@ class NewsScraper:
             db_client: NewsDBClient,
             web_driver: WebDriver,
             headline_picker: NewsHeadlinePicker,
-            n_workers: int = 1
+            n_workers: int = 1,
+            story_clusterer: Optional[StoryClusterer] = None,
+            transport: Optional[HTTPTransport] = None,
+            parser: Optional[HTMLParser] = None
         ) -> None:
         
         self._db_client = db_client
         self._web_driver = web_driver
         self._headline_picker = headline_picker
+        self._story_clusterer = story_clusterer
         self._executor = ThreadPoolExecutor(max_workers=n_workers)
+        
+        # one connection pool shared by all workers,
+        # closed with the scraper only if created here
+        self._owns_transport = transport is None
+        if transport is None:
+            transport = HTTPTransport(pool_size=n_workers)
+        self._transport = transport
+        
+        # parse in the worker threads unless a process pool is provided,
+        # a provided parser is owned and closed by the caller
+        if parser is None:
+            parser = HTMLParser.default()
+        self._parser = parser
     
     @property
     def db_client(self) -> NewsDBClient:
@@ -42,14 +65,41 @@ class NewsScraper:
     @property
     def headline_picker(self) -> NewsHeadlinePicker:
         return self._headline_picker
+    
+    @property
+    def story_clusterer(self) -> Optional[StoryClusterer]:
+        return self._story_clusterer
+    
+    @property
+    def transport(self) -> HTTPTransport:
+        return self._transport
+    
+    @property
+    def parser(self) -> HTMLParser:
+        return self._parser
+        
+    def close(self):
+        """Stop the worker threads and release the connections.
+        
+        Notes
+        -----
+            The transport is only closed if it was created by the scraper.
+            A parser passed to the scraper is owned and closed by the caller.
+        """
+        
+        self._executor.shutdown()
+        
+        if self._owns_transport:
+            self._transport.close()
         
     def scrape_news(
             self,
             query: str,
             date_start: date = date.today(),
             date_end: date = date.today(),
-            language: Language | str = Language.English
-        ):
+            language: Language | str = Language.English,
+            enrich: bool = True
+        ) -> list[NewsSearchResult]:
         """Scrapte news information and then store into MongoDB.
 
         Parameters
@@ -62,6 +112,14 @@ class NewsScraper:
             End date, by default date.today()
         language : Language | str, optional
             Only show the result in the pecified language, by default Language.English
+        enrich : bool, optional
+            Whether to fix truncated headlines of all stored news afterwards, by default True.
+            Set it to False if a HeadlineEnrichmentWorker is running
+
+        Returns
+        -------
+        list[NewsSearchResult]
+            Search results of all dates, including the failed ones
         """
         
         """
@@ -70,7 +128,7 @@ class NewsScraper:
             Scrape news directly from search results.
         """
         
-        self.search_and_store_news(
+        search_results = self.search_and_store_news(
             query=query,
             date_start=date_start,
             date_end=date_end,
@@ -83,38 +141,80 @@ class NewsScraper:
             Visit the news post website and find more information.
         """
         
+        # headlines are fixed by a running HeadlineEnrichmentWorker instead
+        if not enrich: return search_results
+        
         news_with_truncated_headlines = self._db_client.find_news_with_truncated_headlines()
         
         for news in news_with_truncated_headlines:
             
-            news_link = news.get(LINK, None)
-            if news_link is None: continue
-            
-            # we want to get the HTML content of the news post website
+            # the headline may have been fixed through
+            # another copy of the same story in this loop
+            if news.get(STORY_ID, None) is not None \
+                and not self._db_client.is_news_headline_truncated(news.id):
+                continue
             
-            # get HTML via a simple GET request
-            res = requests.get(
-                url=news_link,
-                headers=HEADERS
-            )
-            if res.ok:
-                news_post_html = res.content
-                
-            # get HTML using a web driver
-            else:
-                news_post_html = self._web_driver.get_html(url=news_link)
-            
-            # find the suitable news headline
-            news_headline = find_news_headline_from_news_post_html(
-                html=news_post_html,
-                picker=self._headline_picker
-            )
-            
-            # update the headline
-            self._db_client.update_news_headline(
-                id=news.id,
+            self.enrich_news(news)
+        
+        return search_results
+    
+    def enrich_news(self, news: News) -> bool:
+        """Visit the news post website to fix the truncated headline.
+
+        Parameters
+        ----------
+        news : News
+            News with a truncated headline
+
+        Returns
+        -------
+        bool
+            Whether the headline is updated
+        """
+        
+        news_headline = self.find_news_headline_from_news_post(news)
+        if news_headline is None: return False
+        
+        # update the headline
+        self._db_client.update_news_headline(
+            id=news.id,
+            headline=news_headline
+        )
+        
+        # update the truncated copies of the same article in the story
+        story_id = news.get(STORY_ID, None)
+        if story_id is not None:
+            self._db_client.update_truncated_news_headlines_in_story(
+                story_id=story_id,
                 headline=news_headline
             )
+        
+        return True
+    
+    def find_news_headline_from_news_post(self, news: News) -> Optional[str]:
+        
+        news_link = news.get(LINK, None)
+        if news_link is None: return None
+        
+        # we want to get the HTML content of the news post website
+        
+        # get HTML via a simple GET request
+        fetch_result = self._transport.get(news_link)
+        if fetch_result.ok:
+            news_post_html = fetch_result.content
+            
+        # get HTML using a web driver
+        else:
+            news_post_html = self._web_driver.get_html(url=news_link)
+        
+        # find the suitable news headline
+        news_headline = find_news_headline_from_news_post_html(
+            html=news_post_html,
+            picker=self._headline_picker,
+            parser=self._parser
+        )
+        
+        return news_headline
 
     def search_and_store_news(
             self,
@@ -122,7 +222,7 @@ class NewsScraper:
             date_start: date = date.today(),
             date_end: date = date.today(),
             language: Language | str = Language.English
-        ):
+        ) -> list[NewsSearchResult]:
         """Use Google to search for news and then store them in MongoDB.
         
         Notes
@@ -144,6 +244,11 @@ class NewsScraper:
             End date, by default date.today()
         language : Language | str, optional
             Only show the result in the pecified language, by default Language.English
+
+        Returns
+        -------
+        list[NewsSearchResult]
+            Search results of all dates, including the failed ones
         """
         
         # number of days to search
@@ -173,30 +278,44 @@ class NewsScraper:
         # wait for all tasks to complete
         wait(futures)
         
+        return [future.result() for future in futures]
+        
     def search_and_store_news_on_date(
             self,
             query: str,
             date: date = date.today(),
             language: Language | str = Language.English
-        ):
+        ) -> NewsSearchResult:
         
         # scrape a list of news from Google Search
-        news_list = search_news(
+        search_result = search_news(
             query=query,
             date=date,
-            language=language
+            language=language,
+            transport=self._transport,
+            parser=self._parser
         )
         
+        # nothing to store if the search failed
+        if not search_result.ok:
+            return search_result
+        
         # filter out those news whose links
         # already exist in the database
         news_list = list(filterfalse(
             lambda news: self._db_client.does_news_link_exist(news[LINK]),
-            news_list
+            search_result
         ))
         
+        # group syndicated copies into stories
+        if self._story_clusterer is not None:
+            self._story_clusterer.assign_stories(news_list)
+        
         # insert into database
         self._db_client.insert_many_news(news_list)
         
+        return search_result
+        
 __all__ = [
     'NewsScraper'
 ]
@@ -0,0 +1,161 @@
+from typing import Optional
+import time
+import logging
+from threading import Thread, Event
+from pymongo.errors import OperationFailure
+from pymongo.change_stream import ChangeStream
+from ..schema import News
+from . import NewsScraper
+
+logger = logging.getLogger(__name__)
+
+# name under which the resume token is stored
+RESUME_TOKEN_NAME = 'headline-enrichment'
+
+# how long to wait for new changes before checking whether to stop
+MAX_AWAIT_TIME_MS = 1000
+
+# seconds between saving the resume token while no changes arrive
+RESUME_TOKEN_SAVE_INTERVAL = 60.0
+
+# error code of a resume token no longer in the oplog
+CHANGE_STREAM_HISTORY_LOST_ERROR_CODE = 286
+
+class HeadlineEnrichmentWorker:
+    """Fix truncated headlines as soon as the news are inserted.
+    
+    Notes
+    -----
+        The worker subscribes to a change stream of the inserted news
+        with truncated headlines instead of scanning the whole collection.
+        The resume token is stored after each processed change,
+        and periodically while no changes arrive,
+        so a restarted worker continues right after the last processed news.
+        If the token has dropped out of the oplog, the worker falls back
+        to one scan of all news with truncated headlines.
+        A news that fails to be enriched is logged and skipped,
+        and remains flagged as truncated for a later `scrape_news`.
+    """
+    
+    def __init__(
+            self,
+            scraper: NewsScraper,
+            resume_token_name: str = RESUME_TOKEN_NAME
+        ) -> None:
+        
+        self._scraper = scraper
+        self._resume_token_name = resume_token_name
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+    
+    @property
+    def scraper(self) -> NewsScraper:
+        return self._scraper
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def run(self):
+        """Process changes in the current thread until stopped."""
+        
+        db_client = self._scraper.db_client
+        
+        # continue from where the last run stopped
+        resume_token = db_client.find_resume_token(self._resume_token_name)
+        
+        try:
+            stream = self._watch(resume_token)
+        
+        # the resume token has dropped out of the oplog
+        except OperationFailure as e:
+            if e.code != CHANGE_STREAM_HISTORY_LOST_ERROR_CODE: raise
+            
+            logger.warning('Change stream history is lost, scanning all news with truncated headlines')
+            
+            # open the stream before the scan so that no insertion is missed
+            stream = self._watch(None)
+            self._save_resume_token(stream)
+            
+            for news in db_client.find_news_with_truncated_headlines():
+                if self._stop_event.is_set(): break
+                self._enrich(news)
+        
+        with stream:
+            
+            # time when the resume token was last saved
+            saved_at = time.monotonic()
+            
+            while not self._stop_event.is_set() and stream.alive:
+                
+                # None if there is no change in time
+                change = stream.try_next()
+                
+                if change is not None:
+                    self._enrich(News.from_document(change['fullDocument']))
+                
+                # the token also advances without changes,
+                # saving it keeps it within the oplog window
+                elif time.monotonic() - saved_at < RESUME_TOKEN_SAVE_INTERVAL:
+                    continue
+                
+                # remember the progress
+                self._save_resume_token(stream)
+                saved_at = time.monotonic()
+    
+    def _watch(self, resume_token: Optional[dict]) -> ChangeStream:
+        
+        return self._scraper.db_client.watch_inserted_news_with_truncated_headlines(
+            resume_after=resume_token,
+            max_await_time_ms=MAX_AWAIT_TIME_MS
+        )
+    
+    def _save_resume_token(self, stream: ChangeStream):
+        
+        if stream.resume_token is None: return
+        
+        self._scraper.db_client.update_resume_token(
+            name=self._resume_token_name,
+            resume_token=stream.resume_token
+        )
+    
+    def _enrich(self, news: News):
+        
+        try:
+            
+            # the headline may have been fixed since the insertion,
+            # e.g., through another copy of the same story
+            if self._scraper.db_client.is_news_headline_truncated(news.id):
+                self._scraper.enrich_news(news)
+        
+        except Exception:
+            logger.exception(f'Failed to enrich news {news.id}')
+    
+    def start(self):
+        """Process changes in a background thread."""
+        
+        if self.is_running: return
+        
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run_in_background, daemon=True)
+        self._thread.start()
+    
+    def _run_in_background(self):
+        
+        # errors of the change stream itself stop the worker
+        try:
+            self.run()
+        except Exception:
+            logger.exception('Headline enrichment worker stopped')
+    
+    def stop(self, timeout: Optional[float] = None):
+        
+        self._stop_event.set()
+        
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+__all__ = [
+    'HeadlineEnrichmentWorker'
+]
@@ -2,26 +2,20 @@ from typing import Optional
 import re
 from bs4 import BeautifulSoup, Tag
 from .picker import NewsHeadlinePicker
+from ..parsing import HTMLParser
 
 HEADER_TAG_NAME_RE = re.compile(r'^h1$')
 
 def find_news_headline_from_news_post_html(
         html: str | bytes,
-        picker: Optional[NewsHeadlinePicker] = None
+        picker: Optional[NewsHeadlinePicker] = None,
+        parser: Optional[HTMLParser] = None
     ) -> Optional[str]:
     
-    # make soup
-    soup = BeautifulSoup(html, features='lxml')
-    
-    # all header tags
-    header_tags = soup.find_all(name=HEADER_TAG_NAME_RE)
-    
-    # all header texts
-    header_texts = []
-    tag: Tag
-    for tag in header_tags:
-        if tag.text is not None:
-            header_texts.append(tag.text)
+    # all header texts, possibly parsed in another process
+    if parser is None:
+        parser = HTMLParser.default()
+    header_texts = parser.parse(find_header_texts, html)
 
     # no headline is found
     if len(header_texts) == 0:
@@ -39,6 +33,26 @@ def find_news_headline_from_news_post_html(
     headline = picker.pick(headlines=header_texts)
     
     return headline
+
+def find_header_texts(
+        html: str | bytes,
+        features: str = 'lxml'
+    ) -> list[str]:
+    
+    # make soup
+    soup = BeautifulSoup(html, features=features)
+    
+    # all header tags
+    header_tags = soup.find_all(name=HEADER_TAG_NAME_RE)
+    
+    # all header texts
+    header_texts = []
+    tag: Tag
+    for tag in header_tags:
+        if tag.text is not None:
+            header_texts.append(tag.text)
+    
+    return header_texts
     
 __all__ = [
     'find_news_headline_from_news_post_html',
@@ -0,0 +1,93 @@
+from typing import Self, Optional, Callable, TypeVar
+from threading import Lock
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+T = TypeVar('T')
+
+# parse backends supported by BeautifulSoup
+PARSE_BACKENDS = {'lxml', 'html.parser', 'html5lib'}
+
+# parse backend of the current worker process
+_worker_backend: Optional[str] = None
+
+def _init_worker(backend: str):
+    
+    global _worker_backend
+    _worker_backend = backend
+    
+    # import the parsing libraries once per worker
+    import bs4 # noqa: F401
+    if backend != 'html.parser':
+        __import__(backend)
+
+def _parse_in_worker(parse: Callable[..., T], html: str | bytes) -> T:
+    
+    return parse(html, features=_worker_backend)
+
+class HTMLParser:
+    """Runs parse functions either in the calling thread or in a process pool.
+    
+    Notes
+    -----
+        A parse function takes the raw HTML and the keyword argument `features`,
+        i.e., the BeautifulSoup backend, and must be defined at module level.
+        Only the raw HTML is sent to a worker process and
+        only the plain result, e.g., a list of tuples of strings, is sent back,
+        so the pickling overhead stays small.
+        
+        Workers are spawned rather than forked since the scraper process
+        already runs worker threads and MongoDB monitor threads.
+        The owner of a parser with worker processes should call `close`.
+    """
+    
+    _default: Optional[Self] = None
+    _default_lock = Lock()
+    
+    def __init__(
+            self,
+            backend: str = 'lxml',
+            n_processes: int = 0
+        ) -> None:
+        
+        if backend not in PARSE_BACKENDS:
+            raise ValueError(f'unknown parse backend: {backend}')
+        
+        self._backend = backend
+        
+        # parse in the calling thread if there are no worker processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if n_processes > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=n_processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(backend,)
+            )
+    
+    @classmethod
+    def default(cls) -> Self:
+        """The parser used when none is provided."""
+        
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+        
+        return cls._default
+    
+    @property
+    def backend(self) -> str:
+        return self._backend
+    
+    def parse(self, parse: Callable[..., T], html: str | bytes) -> T:
+        
+        if self._executor is None:
+            return parse(html, features=self._backend)
+        
+        # the calling thread releases the GIL while waiting
+        return self._executor.submit(_parse_in_worker, parse, html).result()
+    
+    def close(self):
+        
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -1,6 +1,5 @@
 from typing import Optional
 from datetime import date, datetime
-import requests
 import urllib.parse
 from bs4 import BeautifulSoup, Tag
 from ..schema import News, Language
@@ -8,57 +7,81 @@ from ..schema.news import (
     DATE, 
     PUBLICATION,
     HEADLINE,
-    LINK
+    LINK,
+    LANGUAGE,
+    to_date_time
 )
 from ..db import IS_HEADLINE_TRUNCATED
-from .utils import (
-    GOOGLE,
-    HEADERS,
-    DATE_FORMAT
-)
+from ..url import canonicalize_url
+from .utils import GOOGLE
+from .transport import HTTPTransport, FetchResult
+from .parsing import HTMLParser
+
+class NewsSearchResult(list):
+    """A list of news found in a search,
+    together with the outcome of the search request.
+    """
+    
+    def __init__(self, *args, fetch_result: FetchResult) -> None:
+        
+        super().__init__(*args)
+        
+        self._fetch_result = fetch_result
+    
+    @property
+    def fetch_result(self) -> FetchResult:
+        return self._fetch_result
+    
+    @property
+    def ok(self) -> bool:
+        return self._fetch_result.ok
+    
+    @property
+    def error(self) -> Optional[str]:
+        return self._fetch_result.error
 
 def search_news(
         query: str,
         date: date = date.today(),
-        language: Language | str = Language.English
-    ) -> list[News]:
+        language: Language | str = Language.English,
+        transport: Optional[HTTPTransport] = None,
+        parser: Optional[HTMLParser] = None
+    ) -> NewsSearchResult:
+    
+    # use the default shared transport
+    if transport is None:
+        transport = HTTPTransport.default()
+    
+    # get language
+    if isinstance(language, str):
+        language = Language.from_str(language)
     
     # create the search URL
     url = create_search_url(query, date, language)
     
     # send the request
-    res = requests.get(
-        url=url,
-        headers=HEADERS
-    )
-    assert res.ok, \
-        f'Failed to send request to {url}'
+    fetch_result = transport.get(url)
     
-    # make soup
-    soup = BeautifulSoup(res.content, features='lxml')
+    # report the failure instead of raising
+    if not fetch_result.ok:
+        return NewsSearchResult(fetch_result=fetch_result)
     
-    # search results
-    search_result_tags = soup.find_all(
-        name='div',
-        attrs={
-            'class': 'SoaBEf'
-        }
-    )
+    # parse the search results, possibly in another process
+    if parser is None:
+        parser = HTMLParser.default()
+    search_results = parser.parse(parse_search_results, fetch_result.content)
     
     # a list of news
-    news_list: list[News] = []
-    for tag in search_result_tags:
-        
-        publication = find_news_publication(tag)
-        headline = find_news_headline_from_search_result_tag(tag)
-        link = find_news_link(tag)
+    news_list = NewsSearchResult(fetch_result=fetch_result)
+    for publication, headline, link in search_results:
         
         # create a news instance
         news = News({
-            DATE: date.strftime(DATE_FORMAT),
+            DATE: to_date_time(date),
             PUBLICATION: publication,
             HEADLINE: headline,
-            LINK: link
+            LINK: link,
+            LANGUAGE: language.value
         })
         
         # set the is_headline_truncated flag
@@ -70,6 +93,32 @@ def search_news(
     
     return news_list
 
+def parse_search_results(
+        html: str | bytes,
+        features: str = 'lxml'
+    ) -> list[tuple[Optional[str], Optional[str], Optional[str]]]:
+    """Extract the publication, headline and link of each search result."""
+    
+    # make soup
+    soup = BeautifulSoup(html, features=features)
+    
+    # search results
+    search_result_tags = soup.find_all(
+        name='div',
+        attrs={
+            'class': 'SoaBEf'
+        }
+    )
+    
+    return [
+        (
+            find_news_publication(tag),
+            find_news_headline_from_search_result_tag(tag),
+            find_news_link(tag)
+        )
+        for tag in search_result_tags
+    ]
+
 def create_search_url(
         query: str,
         date: date = date.today(),
@@ -125,6 +174,10 @@ def find_news_link(tag: Tag) -> Optional[str]:
     link_tag = tag.find(name='a')
     if link_tag is None: return None
     link = link_tag.get('href', None)
+    
+    # store the canonical form so that the same article is recognized
+    # regardless of tracking parameters, AMP variants and redirects
+    link = canonicalize_url(link)
 
     return link
 
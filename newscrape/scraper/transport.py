@@ -0,0 +1,206 @@
+from typing import Self, Optional
+import time
+import random
+from threading import Lock
+import requests
+from requests.adapters import HTTPAdapter
+from .utils import HEADERS
+
+# brotli is decoded by urllib3 only if one of the brotli packages is installed
+try:
+    import brotli # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+# status codes worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class FetchResult:
+    
+    def __init__(
+            self,
+            url: str,
+            status_code: Optional[int] = None,
+            content: Optional[bytes] = None,
+            error: Optional[str] = None,
+            n_attempts: int = 1
+        ) -> None:
+        
+        self._url = url
+        self._status_code = status_code
+        self._content = content
+        self._error = error
+        self._n_attempts = n_attempts
+    
+    def __str__(self) -> str:
+        
+        if self.ok:
+            return f'Fetched {self._url} ({self._status_code})'
+        
+        return f'Failed to fetch {self._url}: {self._error}'
+    
+    def __repr__(self):
+        return str(self)
+    
+    @property
+    def url(self) -> str:
+        return self._url
+    
+    @property
+    def status_code(self) -> Optional[int]:
+        return self._status_code
+    
+    @property
+    def content(self) -> Optional[bytes]:
+        return self._content
+    
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+    
+    @property
+    def n_attempts(self) -> int:
+        return self._n_attempts
+    
+    @property
+    def ok(self) -> bool:
+        return self._error is None
+
+class HTTPTransport:
+    """An HTTP client shared by all threads of the scraper.
+    
+    Notes
+    -----
+        Connections are kept alive in a pool sized to the number of workers.
+        Transient failures, i.e., connection errors, timeouts
+        and the status codes in `RETRY_STATUS_CODES`,
+        are retried with exponential backoff and full jitter.
+    """
+    
+    _default: Optional[Self] = None
+    _default_lock = Lock()
+    
+    def __init__(
+            self,
+            pool_size: int = 10,
+            timeout: float | tuple[float, float] = (5.0, 20.0),
+            max_retries: int = 3,
+            backoff_factor: float = 0.5,
+            max_backoff: float = 10.0
+        ) -> None:
+        
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        
+        # keep-alive connection pool
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=0
+        )
+        
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update(HEADERS)
+        self._session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    
+    @classmethod
+    def default(cls) -> Self:
+        """The transport used when none is provided."""
+        
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+        
+        return cls._default
+    
+    def get(self, url: str) -> FetchResult:
+        
+        n_attempts = 0
+        while True:
+            
+            n_attempts += 1
+            status_code = None
+            retry_after = None
+            
+            try:
+                res = self._session.get(url=url, timeout=self._timeout)
+            
+            # transient network errors
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = f'{type(e).__name__}: {e}'
+            
+            # other errors, e.g., an invalid URL, are not retried
+            except requests.RequestException as e:
+                return FetchResult(
+                    url=url,
+                    error=f'{type(e).__name__}: {e}',
+                    n_attempts=n_attempts
+                )
+            
+            else:
+                
+                if res.ok:
+                    return FetchResult(
+                        url=url,
+                        status_code=res.status_code,
+                        content=res.content,
+                        n_attempts=n_attempts
+                    )
+                
+                status_code = res.status_code
+                error = f'HTTP {status_code}'
+                
+                # client errors other than rate limiting are not retried
+                if status_code not in RETRY_STATUS_CODES:
+                    return FetchResult(
+                        url=url,
+                        status_code=status_code,
+                        error=error,
+                        n_attempts=n_attempts
+                    )
+                
+                retry_after = parse_retry_after(res.headers.get('Retry-After', None))
+            
+            # give up
+            if n_attempts > self._max_retries:
+                return FetchResult(
+                    url=url,
+                    status_code=status_code,
+                    error=error,
+                    n_attempts=n_attempts
+                )
+            
+            time.sleep(self._backoff(n_attempts, retry_after))
+    
+    def _backoff(self, n_attempts: int, retry_after: Optional[float] = None) -> float:
+        
+        # respect the server's request
+        if retry_after is not None:
+            return min(retry_after, self._max_backoff)
+        
+        # exponential backoff with full jitter
+        backoff = min(self._backoff_factor * 2 ** (n_attempts - 1), self._max_backoff)
+        
+        return random.uniform(0, backoff)
+    
+    def close(self):
+        
+        self._session.close()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    
+    if value is None: return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
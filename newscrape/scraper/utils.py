@@ -2,5 +2,4 @@ GOOGLE = 'https://www.google.com'
 USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:106.0) Gecko/20100101 Firefox/106.0'
 HEADERS = {
     'User-Agent': USER_AGENT
-}
-DATE_FORMAT = '%Y-%m-%d'
\ No newline at end of file
+}
\ No newline at end of file
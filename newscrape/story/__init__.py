@@ -0,0 +1,123 @@
+from typing import Optional, Iterable
+from threading import Lock
+from bson import ObjectId
+from ..db import (
+    NewsDBClient,
+    STORY_ID,
+    SIGNATURE
+)
+from ..schema import News
+from ..schema.news import (
+    HEADLINE,
+    LINK
+)
+from .minhash import (
+    MinHasher,
+    news_shingles,
+    estimate_jaccard_similarity
+)
+from .lsh import LSHBands
+
+class StoryClusterer:
+    """Group syndicated copies of the same news story.
+    
+    Notes
+    -----
+        Each news is summarized by a MinHash signature over its headline,
+        or over its link if there is no headline.
+        The signature is split into LSH bands, and the band keys of every story
+        are stored in MongoDB under a multikey index.
+        Candidate stories are hence found by an indexed lookup on the band keys
+        instead of comparing against all stored news.
+        
+        A truncated copy keeps only about half of the headline,
+        hence the default similarity threshold is below 1/2.
+    """
+    
+    def __init__(
+            self,
+            db_client: NewsDBClient,
+            n_bands: int = 32,
+            n_rows: int = 3,
+            similarity_threshold: float = 0.4,
+            seed: int = 1
+        ) -> None:
+        
+        self._db_client = db_client
+        self._bands = LSHBands(n_bands=n_bands, n_rows=n_rows)
+        self._hasher = MinHasher(
+            n_permutations=self._bands.signature_length,
+            seed=seed
+        )
+        self._similarity_threshold = similarity_threshold
+        
+        # assignments from multiple threads must not
+        # create several stories for the same news
+        self._lock = Lock()
+    
+    @property
+    def similarity_threshold(self) -> float:
+        return self._similarity_threshold
+    
+    def shingles(self, news: News) -> set[str]:
+        
+        return news_shingles(
+            headline=news.get(HEADLINE, None),
+            link=news.get(LINK, None)
+        )
+    
+    def signature(self, news: News) -> list[int]:
+        
+        return self._hasher.signature(self.shingles(news))
+    
+    def find_story(self, signature: list[int]) -> Optional[ObjectId]:
+        
+        # stories sharing at least one band with the signature
+        candidates = self._db_client.find_stories_by_band_keys(
+            self._bands.keys(signature)
+        )
+        
+        # pick the most similar candidate
+        best_story_id = None
+        best_similarity = self._similarity_threshold
+        for story in candidates:
+            similarity = estimate_jaccard_similarity(signature, story[SIGNATURE])
+            if similarity >= best_similarity:
+                best_story_id = story['_id']
+                best_similarity = similarity
+        
+        return best_story_id
+    
+    def assign_story(self, news: News) -> Optional[ObjectId]:
+        
+        shingles = self.shingles(news)
+        
+        # all empty sets have the same signature,
+        # so such news would share one catch-all story
+        if len(shingles) == 0: return None
+        
+        signature = self._hasher.signature(shingles)
+        
+        with self._lock:
+            
+            story_id = self.find_story(signature)
+            
+            # start a new story
+            if story_id is None:
+                story_id = self._db_client.insert_story(
+                    signature=signature,
+                    band_keys=self._bands.keys(signature)
+                )
+        
+        news[STORY_ID] = story_id
+        
+        return story_id
+    
+    def assign_stories(self, news_list: Iterable[News]):
+        
+        for news in news_list:
+            self.assign_story(news)
+
+__all__ = [
+    'StoryClusterer'
+]
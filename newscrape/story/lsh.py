@@ -0,0 +1,54 @@
+import hashlib
+
+class LSHBands:
+    
+    def __init__(self, n_bands: int = 32, n_rows: int = 4) -> None:
+        
+        self._n_bands = n_bands
+        self._n_rows = n_rows
+    
+    @property
+    def n_bands(self) -> int:
+        return self._n_bands
+    
+    @property
+    def n_rows(self) -> int:
+        return self._n_rows
+    
+    @property
+    def signature_length(self) -> int:
+        return self._n_bands * self._n_rows
+    
+    @property
+    def threshold(self) -> float:
+        """Approximate Jaccard similarity at which two items
+        become candidates with probability 1/2.
+        """
+        
+        return (1 / self._n_bands) ** (1 / self._n_rows)
+    
+    def keys(self, signature: list[int]) -> list[str]:
+        
+        if len(signature) != self.signature_length:
+            raise ValueError(
+                f'expected a signature of length {self.signature_length}, '
+                f'got {len(signature)}'
+            )
+        
+        keys = []
+        for i in range(self._n_bands):
+            
+            # rows in this band
+            band = signature[i * self._n_rows:(i + 1) * self._n_rows]
+            
+            # hash the band into a short bucket key
+            digest = hashlib.blake2b(
+                b''.join(x.to_bytes(4, 'little') for x in band),
+                digest_size=8
+            ).hexdigest()
+            
+            # prefix the band index so that buckets of
+            # different bands never collide
+            keys.append(f'{i}:{digest}')
+        
+        return keys
@@ -0,0 +1,108 @@
+from typing import Iterable, Optional
+import random
+import hashlib
+from urllib.parse import urlparse
+from ..text import tokenize
+
+# a large prime used by the universal hash functions
+MERSENNE_PRIME = (1 << 61) - 1
+
+# all hash values are truncated to 32 bits
+MAX_HASH = (1 << 32) - 1
+
+def shingle(tokens: list[str], size: int = 2) -> set[str]:
+    
+    # texts shorter than a shingle are treated as a single shingle
+    if len(tokens) <= size:
+        return {' '.join(tokens)} if len(tokens) > 0 else set()
+    
+    return {
+        ' '.join(tokens[i:i + size])
+        for i in range(len(tokens) - size + 1)
+    }
+
+def news_shingles(
+        headline: Optional[str],
+        link: Optional[str] = None,
+        size: int = 2
+    ) -> set[str]:
+    
+    if headline is not None:
+        
+        tokens = tokenize(headline.removesuffix('...'))
+        
+        # the last word of a truncated headline may be cut in the middle
+        if headline.endswith('...') and len(tokens) > 1:
+            tokens = tokens[:-1]
+        
+        shingles = shingle(tokens, size=size)
+        if len(shingles) > 0:
+            return shingles
+    
+    # syndicated copies are hosted under different slugs,
+    # so the link is only used when there is no headline
+    if link is not None:
+        
+        # the domain differs between publications
+        path = urlparse(link).path
+        
+        return {
+            f'link:{s}'
+            for s in shingle(tokenize(path), size=size)
+        }
+    
+    return set()
+
+def hash_shingle(shingle: str) -> int:
+    
+    digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest()
+    
+    return int.from_bytes(digest, 'little')
+
+class MinHasher:
+    
+    def __init__(
+            self,
+            n_permutations: int = 128,
+            seed: int = 1
+        ) -> None:
+        
+        self._n_permutations = n_permutations
+        
+        # coefficients of the hash functions (a * x + b) mod p,
+        # each simulating a random permutation
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randint(1, MERSENNE_PRIME - 1), rng.randint(0, MERSENNE_PRIME - 1))
+            for _ in range(n_permutations)
+        ]
+    
+    @property
+    def n_permutations(self) -> int:
+        return self._n_permutations
+    
+    def signature(self, shingles: Iterable[str]) -> list[int]:
+        
+        # hash each shingle only once
+        hashes = [hash_shingle(s) for s in shingles]
+        
+        # an empty set has the maximum hash value in every slot
+        if len(hashes) == 0:
+            return [MAX_HASH] * self._n_permutations
+        
+        return [
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        ]
+
+def estimate_jaccard_similarity(
+        signature1: list[int],
+        signature2: list[int]
+    ) -> float:
+    
+    if len(signature1) != len(signature2):
+        raise ValueError('signatures must have the same length')
+    
+    n_equal = sum(1 for x, y in zip(signature1, signature2) if x == y)
+    
+    return n_equal / len(signature1)
@@ -0,0 +1,59 @@
+import re
+
+# runs of CJK characters or words
+TOKEN_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]+|\w+')
+CJK_RE = re.compile(r'^[㐀-䶿一-鿿豈-﫿]+$')
+
+def is_cjk(token: str) -> bool:
+    
+    return CJK_RE.match(token) is not None
+
+def contains_cjk(text: str) -> bool:
+    
+    return any(is_cjk(token) for token in TOKEN_RE.findall(text))
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into lower-cased words.
+    
+    Notes
+    -----
+        There are no spaces between Chinese words,
+        hence runs of CJK characters are split into character bigrams.
+    """
+    
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        
+        if is_cjk(token) and len(token) > 1:
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        
+        else:
+            tokens.append(token)
+    
+    return tokens
+
+def truncated_headline_prefix(headline: str) -> str:
+    """The part of a truncated headline that is surely in the full headline.
+    
+    Notes
+    -----
+        The ellipsis is removed, and so is the last word,
+        which may be cut in the middle.
+        Whitespaces are collapsed and letters are lower-cased.
+    """
+    
+    words = headline.removesuffix('...').lower().split()
+    
+    # text without spaces, e.g., Chinese, is cut between characters
+    if len(words) > 1:
+        words = words[:-1]
+    
+    return ' '.join(words)
+
+def is_truncated_headline_of(truncated_headline: str, headline: str) -> bool:
+    """Check whether a truncated headline is the beginning of a full headline."""
+    
+    prefix = truncated_headline_prefix(truncated_headline)
+    
+    return len(prefix) > 0 \
+        and ' '.join(headline.lower().split()).startswith(prefix)
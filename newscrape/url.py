@@ -0,0 +1,141 @@
+from typing import Optional
+import re
+from urllib.parse import (
+    urlsplit,
+    urlunsplit,
+    parse_qsl,
+    unquote_plus
+)
+
+# hosts wrapping the actual link in a redirect
+GOOGLE_HOST_RE = re.compile(r'^(www\.)?google\.[a-z.]+$')
+GOOGLE_REDIRECT_PATH = '/url'
+GOOGLE_REDIRECT_PARAM_NAMES = ('q', 'url')
+
+# query parameters that do not identify the content
+TRACKING_PARAM_NAMES = {
+    'gclid',
+    'dclid',
+    'fbclid',
+    'msclkid',
+    'igshid',
+    'mc_cid',
+    'mc_eid',
+    'ocid',
+    'cmpid',
+    'ref',
+    'ref_src',
+    'ved',
+    'usg',
+    'amp',
+    'outputtype',
+    '_ga',
+    '_gl'
+}
+TRACKING_PARAM_PREFIXES = ('utm_',)
+
+# AMP variants of a path
+AMP_PATH_SUFFIX_RE = re.compile(r'(/amp|\.amp)/?$')
+
+DEFAULT_PORTS = {
+    'http': 80,
+    'https': 443
+}
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """Convert a URL into a canonical form so that
+    links to the same article compare equal.
+    
+    Notes
+    -----
+        - Google redirect wrappers are unwrapped.
+        - The scheme and host are lower-cased, and the default port is dropped.
+        - AMP path suffixes are removed.
+        
+        The canonical URL is also the link to fetch,
+        hence the host is never rewritten.
+        - Tracking parameters are removed and the remaining ones are sorted,
+          without re-encoding them.
+        - The fragment and trailing slash are removed.
+
+    Parameters
+    ----------
+    url : Optional[str]
+        Raw URL, e.g., the `href` of a search result
+
+    Returns
+    -------
+    Optional[str]
+        Canonical URL, or None if no URL is given
+    """
+    
+    if url is None: return None
+    
+    url = url.strip()
+    
+    # unwrap Google redirects, which may be nested
+    while True:
+        target = unwrap_google_redirect(url)
+        if target is None: break
+        url = target
+    
+    parts = urlsplit(url)
+    
+    # relative links cannot be canonicalized
+    if not parts.netloc: return url
+    
+    scheme = parts.scheme.lower()
+    
+    # lower-cased host name, with brackets around IPv6 addresses
+    host = parts.hostname or ''
+    if ':' in host:
+        host = f'[{host}]'
+    
+    # keep non-default ports only
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme, None):
+        host = f'{host}:{parts.port}'
+    
+    # keep the credentials
+    userinfo, separator, _ = parts.netloc.rpartition('@')
+    if separator:
+        host = f'{userinfo}@{host}'
+    
+    # path without AMP suffixes and the trailing slash
+    path = AMP_PATH_SUFFIX_RE.sub('', parts.path)
+    path = path.rstrip('/')
+    
+    # sorted query parameters without tracking parameters,
+    # each kept byte for byte since the URL is fetched later
+    query = '&'.join(sorted(
+        segment
+        for segment in parts.query.split('&')
+        if segment and not is_tracking_param(unquote_plus(segment.partition('=')[0]))
+    ))
+    
+    return urlunsplit((scheme, host, path, query, ''))
+
+def unwrap_google_redirect(url: str) -> Optional[str]:
+    
+    parts = urlsplit(url)
+    
+    # relative redirects, e.g., /url?q=..., come from Google pages
+    if parts.netloc and GOOGLE_HOST_RE.match(parts.hostname or '') is None:
+        return None
+    
+    if parts.path != GOOGLE_REDIRECT_PATH:
+        return None
+    
+    params = dict(parse_qsl(parts.query))
+    for name in GOOGLE_REDIRECT_PARAM_NAMES:
+        target = params.get(name, None)
+        if target is not None and urlsplit(target).netloc:
+            return target
+    
+    return None
+
+def is_tracking_param(name: str) -> bool:
+    
+    name = name.lower()
+    
+    return name in TRACKING_PARAM_NAMES \
+        or name.startswith(TRACKING_PARAM_PREFIXES)
@@ -1,12 +1,99 @@
 from typing import Self, Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 
-CHROME_OPTIONS = webdriver.ChromeOptions()
+# file extensions of resources that are never needed to find the headline
+BLOCKED_EXTENSIONS = [
+    
+    # images
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico',
+    
+    # media
+    'mp4', 'webm', 'm3u8', 'mp3', 'ogg',
+    
+    # fonts
+    'woff', 'woff2', 'ttf', 'otf', 'eot'
+]
+
+# ad and analytics hosts, including their subdomains
+BLOCKED_HOSTS = [
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googletagservices.com',
+    'adservice.google.com',
+    'amazon-adsystem.com',
+    'facebook.net',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'chartbeat.com',
+    'taboola.com',
+    'outbrain.com',
+    'criteo.com',
+    'hotjar.com',
+    'adnxs.com',
+    'rubiconproject.com',
+    'pubmatic.com',
+    'moatads.com'
+]
+
+# patterns of Network.setBlockedURLs, where only * is a wildcard;
+# they are anchored to the end of the path or the host
+# so that, e.g., https://www.webmd.com/ is not blocked by *.webm
+BLOCKED_URL_PATTERNS = [
+    pattern
+    for extension in BLOCKED_EXTENSIONS
+    for pattern in (f'*.{extension}', f'*.{extension}?*')
+] + [
+    pattern
+    for host in BLOCKED_HOSTS
+    for pattern in (f'*://{host}/*', f'*://*.{host}/*')
+]
+
+# the longest time to wait for a page before reading whatever has been loaded
+PAGE_LOAD_DEADLINE = 10.0
+
+# the longest time to wait for the headline after the DOM is ready
+HEADLINE_DEADLINE = 3.0
+
+def create_chrome_options(fast_load: bool = True) -> webdriver.ChromeOptions:
+    
+    options = webdriver.ChromeOptions()
+    
+    # do not display the window
+    options.add_argument('--headless')
+    
+    if fast_load:
+        
+        # return as soon as the DOM is ready instead of
+        # waiting for all subresources
+        options.page_load_strategy = 'eager'
+        
+        # do not load images
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option(
+            'prefs',
+            {
+                'profile.managed_default_content_settings.images': 2
+            }
+        )
+        
+        # do not play media or run unnecessary background features
+        options.add_argument('--autoplay-policy=user-gesture-required')
+        options.add_argument('--mute-audio')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-background-networking')
+    
+    return options
 
-# do not display the window
-CHROME_OPTIONS.add_argument('--headless')
+CHROME_OPTIONS = create_chrome_options(fast_load=True)
 
 class WebDriver(webdriver.Chrome):
     
@@ -15,6 +102,7 @@ class WebDriver(webdriver.Chrome):
         super().__init__(*args, **kwargs)
         
         self._service: Optional[Service] = None
+        self._fast_load = False
     
     def __str__(self) -> str:
         return f'Chrome web driver on port: {self.port}'
@@ -26,9 +114,14 @@ class WebDriver(webdriver.Chrome):
     def port(self) -> int:
         
         return self._service.port
+    
+    @property
+    def fast_load(self) -> bool:
+        
+        return self._fast_load
         
     @classmethod
-    def on_port(cls, port: int = 0) -> Self:
+    def on_port(cls, port: int = 0, fast_load: bool = True) -> Self:
         
         service = Service(
             ChromeDriverManager().install(),
@@ -37,22 +130,47 @@ class WebDriver(webdriver.Chrome):
         
         driver = cls(
             service=service,
-            options=CHROME_OPTIONS
+            options=CHROME_OPTIONS if fast_load else create_chrome_options(fast_load=False)
         )
         
         driver._service = service
         
+        if fast_load:
+            driver._enable_fast_load()
+        
         return driver
     
+    def _enable_fast_load(self):
+        
+        # block images, media, fonts, ads and trackers at the network level
+        self.execute_cdp_cmd('Network.enable', {})
+        self.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        
+        # never wait longer than the deadline for a page
+        self.set_page_load_timeout(PAGE_LOAD_DEADLINE)
+        
+        self._fast_load = True
+    
     def get_html(self, url: str) -> str:
         
         # load the web page
-        self.get(url)
+        try:
+            self.get(url)
+        
+        # stop loading and use what we have got so far
+        except TimeoutException:
+            self.execute_script('window.stop();')
+        
+        # wait until the headline shows up
+        if self._fast_load:
+            try:
+                WebDriverWait(self, HEADLINE_DEADLINE).until(
+                    expected_conditions.presence_of_element_located((By.TAG_NAME, 'h1'))
+                )
+            except TimeoutException:
+                pass
         
         # raw HTML of the page
         html = self.page_source
         
         return html
-    
-    
-    
\ No newline at end of file
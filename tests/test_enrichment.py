@@ -0,0 +1,139 @@
+from typing import Optional
+import pytest
+from pymongo.errors import OperationFailure
+from newscrape.scraper import enrichment
+from newscrape.scraper.enrichment import (
+    HeadlineEnrichmentWorker,
+    CHANGE_STREAM_HISTORY_LOST_ERROR_CODE
+)
+
+class FakeChangeStream:
+    
+    def __init__(self, changes: list[dict], on_exhausted) -> None:
+        
+        self._changes = list(changes)
+        self._on_exhausted = on_exhausted
+        self.resume_token = {'position': 0}
+        self.alive = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.alive = False
+    
+    def try_next(self) -> Optional[dict]:
+        
+        # the token advances even if there are no changes
+        self.resume_token = {'position': self.resume_token['position'] + 1}
+        
+        if len(self._changes) == 0:
+            self._on_exhausted()
+            return None
+        
+        return self._changes.pop(0)
+
+class FakeDBClient:
+    
+    def __init__(self, changes: list[dict], history_lost: bool = False) -> None:
+        
+        self.changes = changes
+        self.history_lost = history_lost
+        self.truncated_ids = {change['fullDocument']['_id'] for change in changes}
+        self.saved_resume_tokens = []
+        self.on_exhausted = None
+    
+    def find_resume_token(self, name: str) -> Optional[dict]:
+        return {'position': -1}
+    
+    def update_resume_token(self, name: str, resume_token: dict):
+        self.saved_resume_tokens.append(resume_token)
+    
+    def watch_inserted_news_with_truncated_headlines(self, resume_after, max_await_time_ms):
+        
+        if resume_after is not None and self.history_lost:
+            raise OperationFailure('history lost', code=CHANGE_STREAM_HISTORY_LOST_ERROR_CODE)
+        
+        return FakeChangeStream(self.changes, self.on_exhausted)
+    
+    def is_news_headline_truncated(self, id) -> bool:
+        return id in self.truncated_ids
+    
+    def find_news_with_truncated_headlines(self) -> list:
+        
+        from newscrape.schema import News
+        return [News.from_document({'_id': 'scanned'})]
+
+class FakeScraper:
+    
+    def __init__(self, db_client: FakeDBClient, failing_ids: set = set()) -> None:
+        
+        self.db_client = db_client
+        self.failing_ids = failing_ids
+        self.enriched_ids = []
+    
+    def enrich_news(self, news) -> bool:
+        
+        if news.id in self.failing_ids:
+            raise RuntimeError('bad page')
+        
+        self.enriched_ids.append(news.id)
+        
+        # other copies of the story are fixed too
+        self.db_client.truncated_ids.clear()
+        
+        return True
+
+def create_worker(db_client: FakeDBClient, failing_ids: set = set()) -> tuple[HeadlineEnrichmentWorker, FakeScraper]:
+    
+    scraper = FakeScraper(db_client, failing_ids)
+    worker = HeadlineEnrichmentWorker(scraper)
+    db_client.on_exhausted = worker._stop_event.set
+    
+    return worker, scraper
+
+def insert_change(id: str) -> dict:
+    return {'fullDocument': {'_id': id}}
+
+def test_failure_is_logged_and_skipped(caplog: pytest.LogCaptureFixture):
+    
+    db_client = FakeDBClient([insert_change('bad'), insert_change('good')])
+    worker, scraper = create_worker(db_client, failing_ids={'bad'})
+    
+    worker.run()
+    
+    assert scraper.enriched_ids == ['good']
+    assert 'Failed to enrich news bad' in caplog.text
+    assert len(db_client.saved_resume_tokens) >= 2
+
+def test_fixed_copies_are_not_fetched_again():
+    
+    db_client = FakeDBClient([insert_change('a'), insert_change('b')])
+    worker, scraper = create_worker(db_client)
+    
+    worker.run()
+    
+    assert scraper.enriched_ids == ['a']
+
+def test_resume_token_is_saved_without_changes(monkeypatch: pytest.MonkeyPatch):
+    
+    monkeypatch.setattr(enrichment, 'RESUME_TOKEN_SAVE_INTERVAL', 0.0)
+    
+    db_client = FakeDBClient([])
+    worker, _ = create_worker(db_client)
+    
+    worker.run()
+    
+    assert db_client.saved_resume_tokens == [{'position': 1}]
+
+def test_history_lost_falls_back_to_scan():
+    
+    db_client = FakeDBClient([insert_change('a')], history_lost=True)
+    db_client.truncated_ids.add('scanned')
+    worker, scraper = create_worker(db_client)
+    
+    worker.run()
+    
+    # the scan fixes the stream's news as well
+    assert scraper.enriched_ids == ['scanned']
+    assert db_client.saved_resume_tokens[0] == {'position': 0}
@@ -0,0 +1,52 @@
+from datetime import datetime
+from newscrape.headline_index import HeadlineIndex
+from newscrape.db import NewsDBClient
+
+def create_headline_index() -> HeadlineIndex:
+    
+    headline_index = HeadlineIndex()
+    headline_index.add(1, 'PwC and Aspen Digital release custody report', datetime(2023, 7, 10), 'en')
+    headline_index.add(2, 'Bitcoin rallies after custody news', datetime(2023, 7, 12), 'en')
+    headline_index.add(3, '經濟增長放緩', datetime(2023, 7, 11), 'zh')
+    
+    return headline_index
+
+def test_rank_by_relevance():
+    
+    results = create_headline_index().search('custody report')
+    
+    assert [id for id, _ in results] == [1, 2]
+
+def test_chinese_queries():
+    
+    headline_index = create_headline_index()
+    
+    assert [id for id, _ in headline_index.search('經濟')] == [3]
+    assert [id for id, _ in headline_index.search('經')] == [3]
+
+def test_filters_and_pagination():
+    
+    headline_index = create_headline_index()
+    
+    assert headline_index.search('custody', language='zh') == []
+    assert [id for id, _ in headline_index.search('custody', date_start=datetime(2023, 7, 11))] == [2]
+    ranking = [id for id, _ in headline_index.search('custody')]
+    assert [id for id, _ in headline_index.search('custody', limit=1, skip=1)] == ranking[1:]
+
+def test_replace_and_remove():
+    
+    headline_index = create_headline_index()
+    headline_index.add(1, 'Something else')
+    headline_index.remove(2)
+    
+    assert headline_index.search('custody') == []
+    assert len(headline_index) == 2
+
+def test_chinese_query_uses_local_index():
+    
+    # no connection is needed since the local search is replaced
+    db_client = object.__new__(NewsDBClient)
+    db_client._use_local_headline_index = False
+    db_client._search_headlines_locally = lambda **kwargs: ['local']
+    
+    assert db_client.search_headlines('经济', language='zh') == ['local']
@@ -0,0 +1,49 @@
+from newscrape.url import canonicalize_url
+from newscrape.bloom import BloomFilter
+from newscrape.db import NewsDBClient
+
+def test_canonicalize_none():
+    
+    assert canonicalize_url(None) is None
+
+def test_unwrap_google_redirect():
+    
+    assert canonicalize_url('/url?q=https://example.com/2023/07/11/title/&sa=U') == \
+        'https://example.com/2023/07/11/title'
+
+def test_remove_tracking_params_and_amp():
+    
+    assert canonicalize_url('https://Example.com:443/news/story/amp/?utm_source=x&id=3&fbclid=1#top') == \
+        'https://example.com/news/story?id=3'
+
+def test_keep_host():
+    
+    assert canonicalize_url('https://amp.example.com/a') == 'https://amp.example.com/a'
+    assert canonicalize_url('https://user:pw@example.com/a') == 'https://user:pw@example.com/a'
+    assert canonicalize_url('https://[::1]:8080/a/') == 'https://[::1]:8080/a'
+
+def test_keep_query_string():
+    
+    assert canonicalize_url('https://ex.com/a?12345') == 'https://ex.com/a?12345'
+    assert canonicalize_url('https://ex.com/a?q=a%20b&p=1') == 'https://ex.com/a?p=1&q=a%20b'
+    assert canonicalize_url('https://ex.com/a?UTM_Medium=a') == 'https://ex.com/a'
+
+def test_bloom_filter():
+    
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    bloom_filter.update(str(i) for i in range(1000))
+    
+    # no false negatives
+    assert all(str(i) in bloom_filter for i in range(1000))
+    
+    # false positives close to the error rate
+    n_false_positives = sum(str(i) in bloom_filter for i in range(1000, 11000))
+    assert n_false_positives < 300
+
+def test_none_link_does_not_exist():
+    
+    # no connection is needed for a None link
+    db_client = object.__new__(NewsDBClient)
+    db_client._news_link_filter = BloomFilter(capacity=10)
+    
+    assert db_client.does_news_link_exist(None) is False
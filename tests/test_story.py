@@ -0,0 +1,74 @@
+from newscrape.text import (
+    tokenize,
+    truncated_headline_prefix,
+    is_truncated_headline_of
+)
+from newscrape.story.minhash import (
+    MinHasher,
+    news_shingles,
+    estimate_jaccard_similarity
+)
+from newscrape.story.lsh import LSHBands
+
+FULL_HEADLINE = 'Aspen Digital and PwC Hong Kong release digital asset custody report for 2023'
+TRUNCATED_HEADLINE = 'Aspen Digital and PwC Hong Kong release digital asset custo...'
+
+def similarity(headline1: str, headline2: str) -> float:
+    
+    hasher = MinHasher(n_permutations=96)
+    
+    return estimate_jaccard_similarity(
+        hasher.signature(news_shingles(headline1)),
+        hasher.signature(news_shingles(headline2))
+    )
+
+def test_tokenize_splits_chinese_into_bigrams():
+    
+    assert tokenize('羅兵咸永道 Aspen') == ['羅兵', '兵咸', '咸永', '永道', 'aspen']
+
+def test_truncated_copy_is_similar():
+    
+    assert similarity(FULL_HEADLINE, TRUNCATED_HEADLINE) >= 0.4
+    assert similarity(FULL_HEADLINE, 'Bitcoin falls below 30k') == 0.0
+
+def test_truncated_chinese_copy_is_similar():
+    
+    assert similarity(
+        '羅兵咸永道與Aspen Digital發布數字資產託管狀況報告',
+        '羅兵咸永道與Aspen Digital發布數字資...'
+    ) >= 0.4
+
+def test_cut_last_word_is_dropped():
+    
+    assert 'link:' not in ''.join(news_shingles(TRUNCATED_HEADLINE, 'https://x.com/a-b'))
+    assert not any('custo' in s for s in news_shingles(TRUNCATED_HEADLINE))
+
+def test_empty_shingle_set():
+    
+    assert news_shingles(None, 'https://x.com/') == set()
+    assert news_shingles('—!', None) == set()
+
+def test_lsh_band_keys():
+    
+    bands = LSHBands(n_bands=32, n_rows=3)
+    keys = bands.keys(MinHasher(n_permutations=96).signature({'a b'}))
+    
+    assert len(keys) == 32
+    assert len(set(keys)) == 32
+    assert keys[0].startswith('0:')
+
+def test_truncated_headline_of_same_article():
+    
+    assert truncated_headline_prefix(TRUNCATED_HEADLINE) == \
+        'aspen digital and pwc hong kong release digital asset'
+    assert is_truncated_headline_of(TRUNCATED_HEADLINE, FULL_HEADLINE)
+    assert is_truncated_headline_of('經濟增長放...', '經濟增長放緩')
+
+def test_truncated_headline_of_another_story():
+    
+    truncated = 'Tesla recalls 2 million vehicles over Autopilot defect ...'
+    
+    assert not is_truncated_headline_of(
+        truncated,
+        'Tesla recalls 2 million vehicles over faulty seat belts'
+    )
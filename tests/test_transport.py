@@ -0,0 +1,106 @@
+import pytest
+import requests
+from newscrape.scraper import transport as transport_module
+from newscrape.scraper.transport import HTTPTransport
+
+class FakeResponse:
+    
+    def __init__(self, status_code: int, headers: dict = {}) -> None:
+        
+        self.status_code = status_code
+        self.headers = headers
+        self.content = b'<html></html>'
+    
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+class FakeSession:
+    
+    def __init__(self, outcomes: list) -> None:
+        
+        self._outcomes = list(outcomes)
+        self.n_requests = 0
+    
+    def get(self, url: str, timeout):
+        
+        self.n_requests += 1
+        outcome = self._outcomes.pop(0)
+        
+        if isinstance(outcome, Exception):
+            raise outcome
+        
+        return outcome
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: pytest.MonkeyPatch):
+    
+    sleeps = []
+    monkeypatch.setattr(transport_module.time, 'sleep', sleeps.append)
+    
+    return sleeps
+
+def create_transport(outcomes: list, max_retries: int = 3) -> HTTPTransport:
+    
+    transport = HTTPTransport(pool_size=1, max_retries=max_retries)
+    transport._session = FakeSession(outcomes)
+    
+    return transport
+
+def test_success():
+    
+    fetch_result = create_transport([FakeResponse(200)]).get('https://example.com')
+    
+    assert fetch_result.ok
+    assert fetch_result.status_code == 200
+    assert fetch_result.content == b'<html></html>'
+    assert fetch_result.n_attempts == 1
+
+def test_retry_transient_errors(no_sleep: list):
+    
+    fetch_result = create_transport([
+        requests.ConnectionError('reset'),
+        FakeResponse(503),
+        FakeResponse(200)
+    ]).get('https://example.com')
+    
+    assert fetch_result.ok
+    assert fetch_result.n_attempts == 3
+    assert len(no_sleep) == 2
+
+def test_honour_retry_after(no_sleep: list):
+    
+    create_transport([
+        FakeResponse(429, {'Retry-After': '2'}),
+        FakeResponse(200)
+    ]).get('https://example.com')
+    
+    assert no_sleep == [2.0]
+
+def test_give_up_after_retries():
+    
+    fetch_result = create_transport(
+        [FakeResponse(502)] * 3,
+        max_retries=2
+    ).get('https://example.com')
+    
+    assert not fetch_result.ok
+    assert fetch_result.status_code == 502
+    assert fetch_result.error == 'HTTP 502'
+    assert fetch_result.n_attempts == 3
+
+def test_client_errors_are_not_retried():
+    
+    fetch_result = create_transport([FakeResponse(404)]).get('https://example.com')
+    
+    assert not fetch_result.ok
+    assert fetch_result.status_code == 404
+    assert fetch_result.n_attempts == 1
+
+def test_invalid_url_is_not_retried():
+    
+    fetch_result = create_transport([requests.exceptions.InvalidURL('bad')]).get('bad')
+    
+    assert not fetch_result.ok
+    assert fetch_result.error.startswith('InvalidURL')
+    assert fetch_result.n_attempts == 1
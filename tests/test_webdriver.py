@@ -0,0 +1,36 @@
+import re
+import pytest
+from newscrape.webdriver import BLOCKED_URL_PATTERNS
+
+def compile_pattern(pattern: str) -> re.Pattern:
+    
+    # Chrome treats only * as a wildcard
+    return re.compile('.*'.join(map(re.escape, pattern.split('*'))))
+
+BLOCKED_URL_RES = list(map(compile_pattern, BLOCKED_URL_PATTERNS))
+
+def is_blocked(url: str) -> bool:
+    
+    return any(blocked_url_re.fullmatch(url) is not None for blocked_url_re in BLOCKED_URL_RES)
+
+@pytest.mark.parametrize('url', [
+    'https://cdn.example.com/a/photo.jpg',
+    'https://cdn.example.com/fonts/font.woff2?v=3',
+    'https://cdn.example.com/video.mp4?token=abc',
+    'https://securepubads.g.doubleclick.net/tag/js/gpt.js',
+    'https://www.google-analytics.com/analytics.js'
+])
+def test_blocked(url: str):
+    
+    assert is_blocked(url)
+
+@pytest.mark.parametrize('url', [
+    'https://www.webmd.com/news/story',
+    'https://www.oggi.it/attualita/notizie',
+    'https://www.gifu-np.co.jp/articles/1',
+    'https://www.icon.example.com/news',
+    'https://example.com/news/facebook.network-outage'
+])
+def test_not_blocked(url: str):
+    
+    assert not is_blocked(url)